@@ -6,10 +6,61 @@ Cross-platform build system for RajOS RTOS
 
 import os
 import sys
+import stat
 import subprocess
 import shutil
+import re
+import hashlib
+import functools
+import atexit
+import concurrent.futures
 from pathlib import Path
 
+# Worker pool shared by every builder in this process (e.g. demo.py)
+_POOL = None
+
+def _get_pool():
+    """Return the shared compile process pool, creating it on first use"""
+    global _POOL
+    if _POOL is None:
+        _POOL = concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count())
+        atexit.register(_POOL.shutdown, wait=False)
+    return _POOL
+
+def _force_rw(func, path, exc_info):
+    """rmtree error handler: clear the read-only bit and retry"""
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
+
+@functools.lru_cache(maxsize=None)
+def find_executables(names):
+    """Resolve several executables with a single walk over PATH"""
+    if os.name == "nt":
+        extensions = [ext.lower() for ext in os.environ.get("PATHEXT", ".EXE").split(os.pathsep) if ext]
+        candidates = {(name + ext).lower(): name for name in names for ext in extensions}
+    else:
+        candidates = {name: name for name in names}
+    
+    found = {}
+    for directory in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        try:
+            entries = os.listdir(directory)
+        except OSError:
+            continue
+        
+        for entry in entries:
+            name = candidates.get(entry.lower() if os.name == "nt" else entry)
+            if name is None or name in found:
+                continue
+            path = os.path.join(directory, entry)
+            if os.access(path, os.X_OK) and not os.path.isdir(path):
+                found[name] = path
+        
+        if len(found) == len(set(names)):
+            break
+    
+    return found
+
 class RajOSBuilder:
     def __init__(self):
         self.project_root = Path(__file__).parent
@@ -35,7 +86,8 @@ class RajOSBuilder:
             "-Wextra",
             "-std=c99",
             "-Os",
-            "-DRAJOS_SEMIHOSTING"
+            "-DRAJOS_SEMIHOSTING",
+            "-MMD"  # Emit <object>.d dependency lists for incremental builds
         ]
         
         self.include_dirs = [
@@ -56,6 +108,10 @@ class RajOSBuilder:
             "-T", "linker.ld"
         ]
         
+        # Command prefixes shared by every compile step
+        self.include_flags = [flag for include_dir in self.include_dirs for flag in ("-I", include_dir)]
+        self.update_command_prefixes()
+        
         # Source files
         self.c_sources = [
             self.src_dir / "kernel" / "kernel.c",
@@ -73,17 +129,29 @@ class RajOSBuilder:
         self.elf_file = self.build_dir / f"{self.target}.elf"
         self.bin_file = self.build_dir / f"{self.target}.bin"
         self.hex_file = self.build_dir / f"{self.target}.hex"
+        self.size_file = self.build_dir / ".size.txt"
+        self.linker_script = self.project_root / "linker.ld"
+        
+        # Content-addressed object cache (survives timestamp-only changes)
+        self.cache_dir = self.build_dir / ".cache"
+        self.cache_max_bytes = 32 * 1024 * 1024
+
+    def update_command_prefixes(self):
+        """Rebuild the cached compiler and assembler command prefixes"""
+        self.c_cmd_prefix = [self.cc, *self.cflags, *self.include_flags, "-c"]
+        self.dep_cmd_prefix = [self.cc, *[flag for flag in self.cflags if flag != "-MMD"],
+                               *self.include_flags, "-MM"]
+        self.asm_cmd_prefix = [self.as_cmd, *self.asflags, "-c"]
 
     def check_toolchain(self):
         """Check if ARM toolchain is available"""
         print("Checking ARM toolchain...")
         
         tools = [self.cc, self.as_cmd, self.ld, self.objcopy, self.size]
-        missing_tools = []
-        
-        for tool in tools:
-            if shutil.which(tool) is None:
-                missing_tools.append(tool)
+        # Tools resolved by an earlier check are already absolute paths
+        found = {tool: tool for tool in tools if os.path.isabs(tool) and os.access(tool, os.X_OK)}
+        found.update(find_executables(tuple(tool for tool in tools if tool not in found)))
+        missing_tools = [tool for tool in tools if tool not in found]
         
         if missing_tools:
             print(f"ERROR: Missing tools: {', '.join(missing_tools)}")
@@ -91,6 +159,14 @@ class RajOSBuilder:
             print("https://developer.arm.com/downloads/-/gnu-rm")
             return False
         
+        # Run the tools by absolute path so exec doesn't search PATH again
+        self.cc = found[self.cc]
+        self.as_cmd = found[self.as_cmd]
+        self.ld = found[self.ld]
+        self.objcopy = found[self.objcopy]
+        self.size = found[self.size]
+        self.update_command_prefixes()
+        
         print("ARM toolchain found")
         return True
 
@@ -108,66 +184,215 @@ class RajOSBuilder:
         for dir_path in dirs_to_create:
             dir_path.mkdir(parents=True, exist_ok=True)
         
+        # Object directories, created once here instead of per compile
+        obj_dirs = {self.object_path(source_file).parent
+                    for source_file in self.c_sources + self.asm_sources}
+        for dir_path in obj_dirs:
+            dir_path.mkdir(parents=True, exist_ok=True)
+        
         print("Build directories created")
 
-    def compile_c_file(self, source_file):
-        """Compile a C source file"""
-        # Create the correct object file path
-        relative_path = source_file.relative_to(self.src_dir)
-        obj_file = self.build_dir / relative_path.with_suffix('.o')
-        
-        # Ensure the object file directory exists
-        obj_file.parent.mkdir(parents=True, exist_ok=True)
+    def object_path(self, source_file):
+        """Return the object file path for a source file"""
+        relative_path = str(source_file.relative_to(self.src_dir))
+        return self.build_dir / (relative_path.rsplit('.', 1)[0] + '.o')
+
+    def parse_dependencies(self, text):
+        """Return the prerequisites of each rule in Makefile-style dependency text"""
+        rules = []
+        for line in text.replace("\r\n", "\n").replace("\\\n", " ").splitlines():
+            _, separator, prerequisites = line.partition(": ")
+            if separator:
+                rules.append([dep.replace("\\ ", " ")
+                              for dep in re.split(r"(?<!\\)\s+", prerequisites) if dep])
+        return rules
+
+    def read_dependencies(self, dep_file):
+        """Return the prerequisites listed in a gcc-generated .d file"""
+        rules = self.parse_dependencies(dep_file.read_text())
+        return rules[0] if rules else []
+
+    def is_up_to_date(self, source_file):
+        """Check if an object file is newer than its source and headers"""
+        obj_file = self.object_path(source_file)
+        dep_file = obj_file.with_suffix('.d')
         
-        cmd = [self.cc] + self.cflags + ["-c", str(source_file), "-o", str(obj_file)]
+        if not obj_file.exists() or not dep_file.exists():
+            return False
         
-        for include_dir in self.include_dirs:
-            cmd.extend(["-I", include_dir])
+        try:
+            deps = [source_file, *self.read_dependencies(dep_file)]
+            newest = max(Path(dep).stat().st_mtime for dep in deps)
+        except OSError:
+            # A dependency was removed or renamed
+            return False
         
-        print(f"Compiling {source_file.name}...")
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        return newest < obj_file.stat().st_mtime
+
+    def touch_object(self, obj_file):
+        """Mark an object as fresh and give its .d file the same timestamp"""
+        # Pinning the .d file to the object's mtime keeps a .d that is newer
+        # than its object (coarse FAT/NFS timestamps) from forcing rebuilds
+        os.utime(obj_file, None)
+        mtime = obj_file.stat().st_mtime_ns
+        dep_file = obj_file.with_suffix('.d')
+        if dep_file.exists():
+            os.utime(dep_file, ns=(mtime, mtime))
+
+    def scan_dependencies(self, sources):
+        """Return the prerequisites of each C source from a single gcc -MM pass"""
+        cmd = [*self.dep_cmd_prefix, *[str(source_file) for source_file in sources]]
         
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, close_fds=False)
         if result.returncode != 0:
-            print(f"ERROR: Compilation failed for {source_file.name}:")
-            print(result.stderr)
             return None
         
-        print(f"Compiled {source_file.name}")
-        return obj_file
+        rules = self.parse_dependencies(result.stdout.decode('utf-8', errors='replace'))
+        return rules if len(rules) == len(sources) else None
+
+    def cache_key(self, source_file, deps):
+        """Hash the compiler flags, source and header contents of a C source"""
+        digest = hashlib.sha256()
+        digest.update("\0".join([self.cc] + self.cflags + self.include_dirs).encode())
+        digest.update(source_file.read_bytes())
+        for dep in sorted(deps):
+            digest.update(Path(dep).read_bytes())
+        return digest.hexdigest()
+
+    def prune_cache(self):
+        """Evict least recently used cached objects beyond cache_max_bytes"""
+        entries = []
+        for cache_file in self.cache_dir.glob("*/*.o"):
+            info = cache_file.stat()
+            entries.append((info.st_atime, info.st_size, cache_file))
+        
+        total = 0
+        for _, size, cache_file in sorted(entries, reverse=True):
+            total += size
+            if total > self.cache_max_bytes:
+                cache_file.unlink()
+
+    def compile_c_batch(self, sources):
+        """Compile C source files that share an object directory in one gcc run"""
+        # Runs in a worker process, so messages go back to build() in a log
+        # alongside the result (None on failure) instead of being printed
+        log = []
+        
+        # gcc writes <basename>.o into its working directory when several
+        # sources are given without -o, so run it inside the object directory
+        obj_dir = self.object_path(sources[0]).parent
+        
+        objects = [self.object_path(source_file) for source_file in sources]
+        
+        sources = [source_file for source_file in sources if not self.is_up_to_date(source_file)]
+        if not sources:
+            log.append(f"Objects in {obj_dir.name} are up to date")
+            return objects, log
+        
+        # Restore what we can from the object cache before spawning the compiler
+        rules = self.scan_dependencies(sources)
+        cache_files = {}
+        misses = []
+        
+        for i, source_file in enumerate(sources):
+            if rules is None:
+                misses.append(source_file)
+                continue
+            
+            deps = rules[i][1:]
+            key = self.cache_key(source_file, deps)
+            cache_file = self.cache_dir / key[:2] / f"{key}.o"
+            obj_file = self.object_path(source_file)
+            
+            if cache_file.exists():
+                # Re-escape spaces the way gcc does so the rule still parses
+                prerequisites = [str(dep).replace(" ", "\\ ") for dep in [source_file, *deps]]
+                obj_file.with_suffix('.d').write_text(
+                    f"{obj_file.name}: " + " \\\n ".join(prerequisites) + "\n")
+                shutil.copyfile(cache_file, obj_file)
+                self.touch_object(obj_file)
+                os.utime(cache_file, None)
+                log.append(f"Restored {source_file.name} from cache")
+            else:
+                cache_files[source_file] = cache_file
+                misses.append(source_file)
+        
+        sources = misses
+        if not sources:
+            return objects, log
+        
+        cmd = [*self.c_cmd_prefix, *[str(source_file) for source_file in sources]]
+        
+        names = ", ".join(source_file.name for source_file in sources)
+        log.append(f"Compiling {names}...")
+        result = subprocess.run(cmd, cwd=obj_dir, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, close_fds=False)
+        
+        if result.returncode != 0:
+            log.append(f"ERROR: Compilation failed for {names}:")
+            log.append(result.stderr.decode('utf-8', errors='replace'))
+            return None, log
+        
+        for source_file in sources:
+            obj_file = self.object_path(source_file)
+            self.touch_object(obj_file)
+            
+            if source_file in cache_files:
+                cache_files[source_file].parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(obj_file, cache_files[source_file])
+        
+        log.append(f"Compiled {names}")
+        return objects, log
 
     def compile_asm_file(self, source_file):
         """Compile an assembly source file"""
-        # Create the correct object file path
-        relative_path = source_file.relative_to(self.src_dir)
-        obj_file = self.build_dir / relative_path.with_suffix('.o')
+        # Returns (object, log) like compile_c_batch
+        log = []
+        obj_file = self.object_path(source_file)
         
-        # Ensure the object file directory exists
-        obj_file.parent.mkdir(parents=True, exist_ok=True)
+        if self.is_up_to_date(source_file):
+            log.append(f"{obj_file.name} is up to date")
+            return obj_file, log
         
-        cmd = [self.as_cmd] + self.asflags + ["-c", str(source_file), "-o", str(obj_file)]
+        cmd = [*self.asm_cmd_prefix, "--MD", str(obj_file.with_suffix('.d')),
+               str(source_file), "-o", str(obj_file)]
         
-        print(f"Assembling {source_file.name}...")
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        log.append(f"Assembling {source_file.name}...")
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, close_fds=False)
         
         if result.returncode != 0:
-            print(f"ERROR: Assembly failed for {source_file.name}:")
-            print(result.stderr)
-            return None
+            log.append(f"ERROR: Assembly failed for {source_file.name}:")
+            log.append(result.stderr.decode('utf-8', errors='replace'))
+            return None, log
+        
+        self.touch_object(obj_file)
         
-        print(f"Assembled {source_file.name}")
-        return obj_file
+        log.append(f"Assembled {source_file.name}")
+        return obj_file, log
+
+    def is_newer_than(self, outputs, inputs):
+        """Check if every output exists and is at least as new as every input"""
+        try:
+            oldest_output = min(output.stat().st_mtime for output in outputs)
+        except OSError:
+            return False
+        return all(path.stat().st_mtime <= oldest_output for path in inputs)
 
     def link(self, object_files):
         """Link object files into ELF"""
+        if self.is_newer_than([self.elf_file], [*object_files, self.linker_script]):
+            print("ELF is up to date")
+            return True
+        
         print("Linking RajOS...")
         
         cmd = [self.cc] + self.ldflags + [str(obj) for obj in object_files] + ["-o", str(self.elf_file)]
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, close_fds=False)
         
         if result.returncode != 0:
             print("ERROR: Linking failed:")
-            print(result.stderr)
+            print(result.stderr.decode('utf-8', errors='replace'))
             return False
         
         print("Linking completed")
@@ -175,24 +400,29 @@ class RajOSBuilder:
 
     def create_binary_files(self):
         """Create binary and hex files"""
+        if self.is_newer_than([self.bin_file, self.hex_file], [self.elf_file]):
+            print("Binary files up to date")
+            return True
+        
         print("Creating binary files...")
         
-        # Create binary file
-        cmd = [self.objcopy, "-O", "binary", str(self.elf_file), str(self.bin_file)]
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # Create binary and hex files concurrently from the same ELF
+        bin_proc = subprocess.Popen([self.objcopy, "-O", "binary", str(self.elf_file), str(self.bin_file)],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, close_fds=False)
+        hex_proc = subprocess.Popen([self.objcopy, "-O", "ihex", str(self.elf_file), str(self.hex_file)],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, close_fds=False)
         
-        if result.returncode != 0:
+        _, bin_errors = bin_proc.communicate()
+        _, hex_errors = hex_proc.communicate()
+        
+        if bin_proc.returncode != 0:
             print("ERROR: Binary creation failed:")
-            print(result.stderr)
+            print(bin_errors.decode('utf-8', errors='replace'))
             return False
         
-        # Create hex file
-        cmd = [self.objcopy, "-O", "ihex", str(self.elf_file), str(self.hex_file)]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
+        if hex_proc.returncode != 0:
             print("ERROR: Hex file creation failed:")
-            print(result.stderr)
+            print(hex_errors.decode('utf-8', errors='replace'))
             return False
         
         print("Binary files created")
@@ -201,10 +431,25 @@ class RajOSBuilder:
     def show_build_info(self):
         """Show build information"""
         if self.elf_file.exists():
-            result = subprocess.run([self.size, str(self.elf_file)], capture_output=True, text=True)
-            if result.returncode == 0:
+            # Reuse the size report from the last run if the ELF hasn't changed
+            stamp = str(self.elf_file.stat().st_mtime_ns)
+            size_output = None
+            
+            if self.size_file.exists():
+                cached_stamp, _, cached_output = self.size_file.read_text().partition("\n")
+                if cached_stamp == stamp:
+                    size_output = cached_output
+            
+            if size_output is None:
+                result = subprocess.run([self.size, str(self.elf_file)], stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL)
+                if result.returncode == 0:
+                    size_output = result.stdout.decode('ascii', errors='replace')
+                    self.size_file.write_text(f"{stamp}\n{size_output}")
+            
+            if size_output is not None:
                 print("\nBuild Information:")
-                print(result.stdout)
+                print(size_output)
         
         print(f"\nOutput files:")
         print(f"   ELF: {self.elf_file}")
@@ -223,31 +468,46 @@ class RajOSBuilder:
         # Create build directories
         self.create_build_dirs()
         
-        # Compile all source files
-        object_files = []
-        
-        # Compile C files
+        # Compile all source files in parallel. C sources are batched per
+        # object directory so each group costs a single gcc process.
+        sources = []
+        c_groups = {}
         for c_file in self.c_sources:
             if c_file.exists():
-                obj_file = self.compile_c_file(c_file)
-                if obj_file:
-                    object_files.append(obj_file)
-                else:
-                    return False
+                sources.append(c_file)
+                c_groups.setdefault(self.object_path(c_file).parent, []).append(c_file)
             else:
                 print(f"Warning: {c_file} not found")
         
-        # Compile assembly files
+        asm_files = []
         for asm_file in self.asm_sources:
             if asm_file.exists():
-                obj_file = self.compile_asm_file(asm_file)
-                if obj_file:
-                    object_files.append(obj_file)
-                else:
-                    return False
+                sources.append(asm_file)
+                asm_files.append(asm_file)
             else:
                 print(f"Warning: {asm_file} not found")
         
+        executor = _get_pool()
+        futures = [executor.submit(self.compile_c_batch, group) for group in c_groups.values()]
+        futures += [executor.submit(self.compile_asm_file, asm_file) for asm_file in asm_files]
+        
+        for future in concurrent.futures.as_completed(futures):
+            # Print worker output here so it follows this process's sys.stdout
+            result, log = future.result()
+            for message in log:
+                print(message)
+            
+            if result is None:
+                for pending in futures:
+                    pending.cancel()
+                concurrent.futures.wait(futures)
+                return False
+        
+        # Keep link order stable regardless of batching and completion order
+        object_files = [self.object_path(source_file) for source_file in sources]
+        
+        self.prune_cache()
+        
         if not object_files:
             print("ERROR: No object files created")
             return False
@@ -270,10 +530,16 @@ class RajOSBuilder:
         """Clean build artifacts"""
         print("Cleaning build artifacts...")
         
-        if self.build_dir.exists():
-            shutil.rmtree(self.build_dir)
-            print("Build directory cleaned")
+        # onerror is deprecated in favour of onexc from Python 3.12
+        if sys.version_info >= (3, 12):
+            handler = {"onexc": _force_rw}
         else:
+            handler = {"onerror": _force_rw}
+        
+        try:
+            shutil.rmtree(self.build_dir, **handler)
+            print("Build directory cleaned")
+        except FileNotFoundError:
             print("Build directory doesn't exist")
 
 def main():
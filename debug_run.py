@@ -9,8 +9,19 @@ import subprocess
 import sys
 import shutil
 import time
+import re
+import threading
+import functools
 from pathlib import Path
 
+# Printed by the kernel once it has booted
+BANNER_PATTERN = re.compile(rb"RajOS v\d+\.\d+")
+
+@functools.lru_cache(maxsize=None)
+def _which(name):
+    """Memoized shutil.which"""
+    return shutil.which(name)
+
 def check_qemu():
     """Check if QEMU is available"""
     qemu_paths = [
@@ -18,11 +29,7 @@ def check_qemu():
         "C:\\Program Files\\qemu\\qemu-system-arm.exe"  # Windows path
     ]
     
-    for qemu_path in qemu_paths:
-        if shutil.which(qemu_path) or Path(qemu_path).exists():
-            return qemu_path
-    
-    return None
+    return next((path for path in map(_which, qemu_paths) if path), None)
 
 def test_qemu_basic():
     """Test basic QEMU functionality"""
@@ -36,17 +43,24 @@ def test_qemu_basic():
     # Test QEMU version
     try:
         result = subprocess.run([qemu_cmd, "--version"], 
-                              capture_output=True, text=True, timeout=10)
+                              capture_output=True, timeout=10)
         if result.returncode == 0:
-            print(f"QEMU Version: {result.stdout.strip()}")
+            print(f"QEMU Version: {result.stdout.decode('utf-8', errors='replace').strip()}")
             return True
         else:
-            print(f"QEMU version check failed: {result.stderr}")
+            print(f"QEMU version check failed: {result.stderr.decode('utf-8', errors='replace')}")
             return False
     except Exception as e:
         print(f"QEMU test failed: {e}")
         return False
 
+def drain_stream(stream, lines, banner_seen):
+    """Collect lines from a pipe until EOF, flagging the RajOS banner"""
+    for line in iter(stream.readline, b""):
+        lines.append(line)
+        if BANNER_PATTERN.search(line):
+            banner_seen.set()
+
 def test_rajos_different_configs():
     """Try different QEMU configurations"""
     qemu_cmd = check_qemu()
@@ -76,7 +90,7 @@ def test_rajos_different_configs():
     ]
     
     print("Testing different QEMU configurations...")
-    print("Each test will run for 5 seconds")
+    print("Each test will run for up to 5 seconds")
     print()
     
     for i, config in enumerate(configs, 1):
@@ -86,38 +100,49 @@ def test_rajos_different_configs():
         print("-" * 40)
         
         try:
-            # Run for 5 seconds then kill
+            # Run for up to 5 seconds then kill
             process = subprocess.Popen(config['cmd'], 
                                      stdout=subprocess.PIPE, 
-                                     stderr=subprocess.PIPE,
-                                     text=True)
+                                     stderr=subprocess.PIPE)
             
-            # Wait for 5 seconds
-            time.sleep(5)
+            stdout_lines = []
+            stderr_lines = []
+            banner_seen = threading.Event()
+            readers = [
+                threading.Thread(target=drain_stream, args=(process.stdout, stdout_lines, banner_seen), daemon=True),
+                threading.Thread(target=drain_stream, args=(process.stderr, stderr_lines, banner_seen), daemon=True)
+            ]
+            for reader in readers:
+                reader.start()
             
-            # Check if there's any output
-            try:
-                stdout, stderr = process.communicate(timeout=1)
-                if stdout:
-                    print("STDOUT:")
-                    print(stdout)
-                if stderr:
-                    print("STDERR:")
-                    print(stderr)
-                    
-                if not stdout and not stderr:
-                    print("No output detected")
-                    
-            except subprocess.TimeoutExpired:
+            # Stop waiting as soon as QEMU exits or the kernel banner shows up
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline and process.poll() is None:
+                if banner_seen.wait(0.05):
+                    break
+            
+            if process.poll() is None:
                 process.kill()
-                stdout, stderr = process.communicate()
-                print("Process killed after timeout")
-                if stdout:
-                    print("STDOUT:")
-                    print(stdout)
-                if stderr:
-                    print("STDERR:")
-                    print(stderr)
+                if banner_seen.is_set():
+                    print("Process killed after kernel banner")
+                else:
+                    print("Process killed after timeout")
+            process.wait()
+            
+            for reader in readers:
+                reader.join(timeout=1)
+            
+            stdout = b"".join(stdout_lines).decode('utf-8', errors='replace')
+            stderr = b"".join(stderr_lines).decode('utf-8', errors='replace')
+            if stdout:
+                print("STDOUT:")
+                print(stdout)
+            if stderr:
+                print("STDERR:")
+                print(stderr)
+            
+            if not stdout and not stderr:
+                print("No output detected")
                 
         except Exception as e:
             print(f"Test failed: {e}")
@@ -140,10 +165,10 @@ def check_elf_file():
     # Try to get ELF info using objdump if available
     try:
         result = subprocess.run(["arm-none-eabi-objdump", "-h", str(elf_file)], 
-                              capture_output=True, text=True, timeout=10)
+                              capture_output=True, timeout=10)
         if result.returncode == 0:
             print("ELF sections:")
-            print(result.stdout)
+            print(result.stdout.decode('utf-8', errors='replace'))
         else:
             print("Could not analyze ELF file")
     except:
@@ -7,12 +7,23 @@ A clean, simple demonstration of RajOS capabilities
 import subprocess
 import sys
 import shutil
+import functools
+import contextlib
+import io
 from pathlib import Path
 
+from build import RajOSBuilder
+
+@functools.lru_cache(maxsize=None)
+def _which(name):
+    """Memoized shutil.which"""
+    return shutil.which(name)
+
 class RajOSDemo:
-    def __init__(self):
+    def __init__(self, clean=False):
         self.project_root = Path(__file__).parent
         self.build_dir = self.project_root / "build"
+        self.clean = clean
         
     def print_header(self):
         """Print demo header"""
@@ -31,25 +42,20 @@ class RajOSDemo:
         print("🔍 Checking prerequisites...")
         
         # Check ARM toolchain
-        if not shutil.which("arm-none-eabi-gcc"):
+        if not _which("arm-none-eabi-gcc"):
             print("ERROR: ARM GNU Toolchain not found!")
             print("   Please install from: https://developer.arm.com/downloads/-/gnu-rm")
             return False
         
         # Check QEMU
-        qemu_found = False
         qemu_paths = [
             "qemu-system-arm",
             "C:\\Program Files\\qemu\\qemu-system-arm.exe"
         ]
         
-        for qemu_path in qemu_paths:
-            if shutil.which(qemu_path) or Path(qemu_path).exists():
-                qemu_found = True
-                self.qemu_cmd = qemu_path
-                break
+        self.qemu_cmd = next((path for path in map(_which, qemu_paths) if path), None)
         
-        if not qemu_found:
+        if not self.qemu_cmd:
             print("ERROR: QEMU not found!")
             print("   Please install from: https://www.qemu.org/download/")
             return False
@@ -62,17 +68,19 @@ class RajOSDemo:
         print("\nBuilding RajOS...")
         print("-" * 40)
         
-        # Clean previous build
-        if self.build_dir.exists():
-            shutil.rmtree(self.build_dir)
+        # Build in-process, only showing the build log if something fails
+        builder = RajOSBuilder()
+        build_log = io.StringIO()
         
-        # Run build script
-        result = subprocess.run([sys.executable, "build.py"], 
-                              capture_output=True, text=True)
+        with contextlib.redirect_stdout(build_log):
+            # Reuse objects from earlier builds unless a clean build was requested
+            if self.clean:
+                builder.clean()
+            success = builder.build()
         
-        if result.returncode != 0:
+        if not success:
             print("ERROR: Build failed!")
-            print(result.stderr)
+            print(build_log.getvalue())
             return False
         
         print("SUCCESS: Build completed successfully!")
@@ -193,16 +201,22 @@ class RajOSDemo:
         return True
 
 def main():
-    demo = RajOSDemo()
+    args = sys.argv[1:]
+    clean = "--clean" in args
+    if clean:
+        args.remove("--clean")
+    
+    demo = RajOSDemo(clean=clean)
     
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "help":
+    if args:
+        if args[0] == "help":
             print("RajOS Demo Script")
             print("Usage:")
-            print("  python demo.py        # Run full demo")
-            print("  python demo.py help   # Show this help")
+            print("  python demo.py          # Run full demo")
+            print("  python demo.py --clean  # Run full demo from a clean build")
+            print("  python demo.py help     # Show this help")
         else:
-            print(f"Unknown command: {sys.argv[1]}")
+            print(f"Unknown command: {args[0]}")
             print("Use 'python demo.py help' for usage information")
     else:
         success = demo.run_full_demo()
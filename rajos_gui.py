@@ -5,28 +5,70 @@ A modern GUI application that demonstrates RajOS architecture and provides testi
 """
 
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox, filedialog
-import subprocess
+from tkinter import ttk
 import threading
+import asyncio
 import queue
 import os
 import sys
-from datetime import datetime
-import json
+import time
+
+# Architecture diagram: (shape, bounding box, layer, label, font size)
+ARCH_COLORS = {
+    'kernel': '#00ff88',
+    'drivers': '#00ccff',
+    'hardware': '#ff8800',
+    'text': '#ffffff'
+}
+
+ARCH_SHAPES = [
+    ("rectangle", (50, 50, 350, 150), 'kernel', "RajOS Kernel", 14),
+    ("rectangle", (50, 170, 150, 220), 'kernel', "Task\nManager", 10),
+    ("rectangle", (160, 170, 260, 220), 'kernel', "Memory\nManager", 10),
+    ("rectangle", (270, 170, 370, 220), 'kernel', "Scheduler", 10),
+    ("rectangle", (50, 250, 350, 320), 'drivers', "Hardware Drivers", 12),
+    ("rectangle", (50, 330, 150, 380), 'drivers', "UART\nDriver", 10),
+    ("rectangle", (160, 330, 260, 380), 'drivers', "Timer\nDriver", 10),
+    ("rectangle", (50, 400, 350, 480), 'hardware', "Hardware Layer", 12),
+    ("oval", (100, 410, 150, 460), 'hardware', "ARM\nCPU", 8),
+    ("oval", (200, 410, 250, 460), 'hardware', "RAM/\nFlash", 8),
+    ("oval", (300, 410, 350, 460), 'hardware', "UART/\nTimer", 8),
+]
+
+ARCH_ARROWS = [
+    (200, 150, 200, 250),
+    (200, 320, 200, 400),
+]
+
+ARCH_SIZE = (400, 500)
+
+# ttk styles are registered once per process
+_STYLES_DONE = False
 
 class RajOSGUI:
+    # Pre-rendered architecture diagram, shared by all windows
+    _arch_cache = None
+    
     def __init__(self, root):
         self.root = root
         self.root.title("RajOS - Real-Time Operating System Showcase")
         self.root.geometry("1200x800")
         self.root.configure(bg='#2b2b2b')
         
-        # Output queue for thread-safe updates
+        # Output queue of (tag, line) pairs for thread-safe updates
         self.output_queue = queue.Queue()
         
+        # Oldest output lines are dropped beyond this many
+        self.max_output_lines = 5000
+        
         # Current process
         self.current_process = None
-        self.is_running = False
+        self.qemu_path = None
+        self.run_future = None
+        
+        # Event loop that streams subprocess output in the background
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
         
         self.setup_styles()
         self.create_widgets()
@@ -34,6 +76,11 @@ class RajOSGUI:
         
     def setup_styles(self):
         """Configure modern styling for the GUI"""
+        global _STYLES_DONE
+        if _STYLES_DONE:
+            return
+        _STYLES_DONE = True
+        
         style = ttk.Style()
         style.theme_use('clam')
         
@@ -61,10 +108,31 @@ class RajOSGUI:
                        background='#ff4444',
                        foreground='#ffffff')
         
+    def dark_frame(self, parent):
+        """Create a frame with the dark window background"""
+        return tk.Frame(parent, bg='#2b2b2b')
+        
+    def make_combo(self, parent, label, variable, values):
+        """Create a labelled read-only combobox row"""
+        row = self.dark_frame(parent)
+        row.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Label(row, 
+                 text=label,
+                 style='Info.TLabel').pack(side=tk.LEFT)
+        
+        combo = ttk.Combobox(row, 
+                             textvariable=variable,
+                             values=values,
+                             state="readonly",
+                             width=15)
+        combo.pack(side=tk.LEFT, padx=(10, 0))
+        return combo
+        
     def create_widgets(self):
         """Create and arrange all GUI widgets"""
         # Main container
-        main_frame = tk.Frame(self.root, bg='#2b2b2b')
+        main_frame = self.dark_frame(self.root)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Title
@@ -138,6 +206,15 @@ Perfect For:
         arch_frame = ttk.Frame(notebook)
         notebook.add(arch_frame, text="Architecture")
         
+        # Show the cached diagram as a single image when Pillow is available
+        if RajOSGUI._arch_cache is None:
+            RajOSGUI._arch_cache = self.render_architecture_image()
+        
+        if RajOSGUI._arch_cache is not None:
+            diagram = tk.Label(arch_frame, image=RajOSGUI._arch_cache, bg='#1e1e1e', anchor=tk.NW)
+            diagram.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+            return
+        
         # Create canvas for architecture diagram
         canvas = tk.Canvas(arch_frame, bg='#1e1e1e', height=600)
         canvas.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -145,85 +222,60 @@ Perfect For:
         # Draw architecture diagram
         self.draw_architecture_diagram(canvas)
         
+    def render_architecture_image(self):
+        """Render the architecture diagram into a PhotoImage, or None without Pillow"""
+        try:
+            from PIL import Image, ImageDraw, ImageFont, ImageTk
+        except ImportError:
+            return None
+        
+        def load_font(points):
+            size = round(points * 4 / 3)
+            for name in ("segoeuib.ttf", "DejaVuSans-Bold.ttf"):
+                try:
+                    return ImageFont.truetype(name, size)
+                except OSError:
+                    continue
+            return ImageFont.load_default()
+        
+        # Load each font size once; several shapes share a size
+        fonts = {points: load_font(points) for points in {shape[4] for shape in ARCH_SHAPES}}
+        
+        image = Image.new("RGB", ARCH_SIZE, '#1e1e1e')
+        draw = ImageDraw.Draw(image)
+        shapes = {"rectangle": draw.rectangle, "oval": draw.ellipse}
+        
+        for shape, bbox, layer, label, points in ARCH_SHAPES:
+            shapes[shape](bbox, fill=ARCH_COLORS[layer], outline='#ffffff', width=2)
+            
+            font = fonts[points]
+            try:
+                left, top, right, bottom = draw.multiline_textbbox((0, 0), label, font=font, align="center")
+            except (AttributeError, ValueError):
+                # Pillow < 8 has no textbbox and Pillow < 9.2 can't measure
+                # bitmap fonts; use the canvas instead
+                return None
+            x = (bbox[0] + bbox[2] - (right - left)) / 2 - left
+            y = (bbox[1] + bbox[3] - (bottom - top)) / 2 - top
+            draw.multiline_text((x, y), label, fill='#000000', font=font, align="center")
+        
+        for x1, y1, x2, y2 in ARCH_ARROWS:
+            draw.line((x1, y1, x2, y2), fill=ARCH_COLORS['text'], width=2)
+            draw.polygon([(x2, y2), (x2 - 5, y2 - 10), (x2 + 5, y2 - 10)], fill=ARCH_COLORS['text'])
+        
+        return ImageTk.PhotoImage(image)
+        
     def draw_architecture_diagram(self, canvas):
         """Draw the RajOS architecture diagram"""
-        # Colors
-        colors = {
-            'kernel': '#00ff88',
-            'drivers': '#00ccff',
-            'hardware': '#ff8800',
-            'text': '#ffffff'
-        }
-        
-        # Kernel layer
-        canvas.create_rectangle(50, 50, 350, 150, 
-                              fill=colors['kernel'], outline='#ffffff', width=2)
-        canvas.create_text(200, 100, text="RajOS Kernel", 
-                          font=('Segoe UI', 14, 'bold'), fill='#000000')
-        
-        # Task management
-        canvas.create_rectangle(50, 170, 150, 220, 
-                              fill=colors['kernel'], outline='#ffffff', width=2)
-        canvas.create_text(100, 195, text="Task\nManager", 
-                          font=('Segoe UI', 10, 'bold'), fill='#000000')
-        
-        # Memory management
-        canvas.create_rectangle(160, 170, 260, 220, 
-                              fill=colors['kernel'], outline='#ffffff', width=2)
-        canvas.create_text(210, 195, text="Memory\nManager", 
-                          font=('Segoe UI', 10, 'bold'), fill='#000000')
-        
-        # Scheduler
-        canvas.create_rectangle(270, 170, 370, 220, 
-                              fill=colors['kernel'], outline='#ffffff', width=2)
-        canvas.create_text(320, 195, text="Scheduler", 
-                          font=('Segoe UI', 10, 'bold'), fill='#000000')
-        
-        # Drivers layer
-        canvas.create_rectangle(50, 250, 350, 320, 
-                              fill=colors['drivers'], outline='#ffffff', width=2)
-        canvas.create_text(200, 285, text="Hardware Drivers", 
-                          font=('Segoe UI', 12, 'bold'), fill='#000000')
-        
-        # UART driver
-        canvas.create_rectangle(50, 330, 150, 380, 
-                              fill=colors['drivers'], outline='#ffffff', width=2)
-        canvas.create_text(100, 355, text="UART\nDriver", 
-                          font=('Segoe UI', 10, 'bold'), fill='#000000')
-        
-        # Timer driver
-        canvas.create_rectangle(160, 330, 260, 380, 
-                              fill=colors['drivers'], outline='#ffffff', width=2)
-        canvas.create_text(210, 355, text="Timer\nDriver", 
-                          font=('Segoe UI', 10, 'bold'), fill='#000000')
-        
-        # Hardware layer
-        canvas.create_rectangle(50, 400, 350, 480, 
-                              fill=colors['hardware'], outline='#ffffff', width=2)
-        canvas.create_text(200, 440, text="Hardware Layer", 
-                          font=('Segoe UI', 12, 'bold'), fill='#000000')
-        
-        # ARM CPU
-        canvas.create_oval(100, 410, 150, 460, 
-                          fill=colors['hardware'], outline='#ffffff', width=2)
-        canvas.create_text(125, 435, text="ARM\nCPU", 
-                          font=('Segoe UI', 8, 'bold'), fill='#000000')
-        
-        # Memory
-        canvas.create_oval(200, 410, 250, 460, 
-                          fill=colors['hardware'], outline='#ffffff', width=2)
-        canvas.create_text(225, 435, text="RAM/\nFlash", 
-                          font=('Segoe UI', 8, 'bold'), fill='#000000')
-        
-        # Peripherals
-        canvas.create_oval(300, 410, 350, 460, 
-                          fill=colors['hardware'], outline='#ffffff', width=2)
-        canvas.create_text(325, 435, text="UART/\nTimer", 
-                          font=('Segoe UI', 8, 'bold'), fill='#000000')
+        for shape, bbox, layer, label, points in ARCH_SHAPES:
+            create = canvas.create_rectangle if shape == "rectangle" else canvas.create_oval
+            create(*bbox, fill=ARCH_COLORS[layer], outline='#ffffff', width=2)
+            canvas.create_text((bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2, text=label,
+                               font=('Segoe UI', points, 'bold'), fill='#000000')
         
         # Arrows
-        canvas.create_line(200, 150, 200, 250, fill=colors['text'], width=2, arrow=tk.LAST)
-        canvas.create_line(200, 320, 200, 400, fill=colors['text'], width=2, arrow=tk.LAST)
+        for arrow in ARCH_ARROWS:
+            canvas.create_line(*arrow, fill=ARCH_COLORS['text'], width=2, arrow=tk.LAST)
         
     def create_testing_tab(self, notebook):
         """Create the testing tab for running and testing RajOS"""
@@ -231,7 +283,7 @@ Perfect For:
         notebook.add(test_frame, text="Testing")
         
         # Testing controls
-        controls_frame = tk.Frame(test_frame, bg='#2b2b2b')
+        controls_frame = self.dark_frame(test_frame)
         controls_frame.pack(fill=tk.X, padx=20, pady=20)
         
         # Build button
@@ -263,7 +315,7 @@ Perfect For:
         clear_btn.pack(side=tk.LEFT, padx=(0, 10))
         
         # Status frame
-        status_frame = tk.Frame(test_frame, bg='#2b2b2b')
+        status_frame = self.dark_frame(test_frame)
         status_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
         
         # Status label
@@ -287,52 +339,19 @@ Perfect For:
         options_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
         
         # QEMU machine selection
-        machine_frame = tk.Frame(options_frame, bg='#2b2b2b')
-        machine_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        ttk.Label(machine_frame, 
-                 text="QEMU Machine:",
-                 style='Info.TLabel').pack(side=tk.LEFT)
-        
         self.machine_var = tk.StringVar(value="versatileab")
-        machine_combo = ttk.Combobox(machine_frame, 
-                                    textvariable=self.machine_var,
-                                    values=["versatileab", "mps2-an385", "lm3s6965evb"],
-                                    state="readonly",
-                                    width=15)
-        machine_combo.pack(side=tk.LEFT, padx=(10, 0))
+        self.make_combo(options_frame, "QEMU Machine:", self.machine_var,
+                        ["versatileab", "mps2-an385", "lm3s6965evb"])
         
         # CPU selection
-        cpu_frame = tk.Frame(options_frame, bg='#2b2b2b')
-        cpu_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        ttk.Label(cpu_frame, 
-                 text="CPU Type:",
-                 style='Info.TLabel').pack(side=tk.LEFT)
-        
         self.cpu_var = tk.StringVar(value="arm926")
-        cpu_combo = ttk.Combobox(cpu_frame, 
-                                 textvariable=self.cpu_var,
-                                 values=["arm926", "cortex-m3"],
-                                 state="readonly",
-                                 width=15)
-        cpu_combo.pack(side=tk.LEFT, padx=(10, 0))
+        self.make_combo(options_frame, "CPU Type:", self.cpu_var,
+                        ["arm926", "cortex-m3"])
         
         # Output mode
-        output_frame = tk.Frame(options_frame, bg='#2b2b2b')
-        output_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        ttk.Label(output_frame, 
-                 text="Output Mode:",
-                 style='Info.TLabel').pack(side=tk.LEFT)
-        
         self.output_mode = tk.StringVar(value="console")
-        output_combo = ttk.Combobox(output_frame, 
-                                   textvariable=self.output_mode,
-                                   values=["console", "file", "gui"],
-                                   state="readonly",
-                                   width=15)
-        output_combo.pack(side=tk.LEFT, padx=(10, 0))
+        self.make_combo(options_frame, "Output Mode:", self.output_mode,
+                        ["console", "file", "gui"])
         
     def create_build_tab(self, notebook):
         """Create the build tab showing build configuration and process"""
@@ -348,7 +367,7 @@ Perfect For:
         config_frame.pack(fill=tk.X, padx=20, pady=20)
         
         # Compiler settings
-        compiler_frame = tk.Frame(config_frame, bg='#2b2b2b')
+        compiler_frame = self.dark_frame(config_frame)
         compiler_frame.pack(fill=tk.X, padx=10, pady=10)
         
         ttk.Label(compiler_frame, 
@@ -362,7 +381,7 @@ Perfect For:
         compiler_entry.pack(side=tk.LEFT, padx=(10, 0))
         
         # Build flags
-        flags_frame = tk.Frame(config_frame, bg='#2b2b2b')
+        flags_frame = self.dark_frame(config_frame)
         flags_frame.pack(fill=tk.X, padx=10, pady=10)
         
         ttk.Label(flags_frame, 
@@ -376,7 +395,7 @@ Perfect For:
         cflags_entry.pack(side=tk.LEFT, padx=(10, 0))
         
         # Linker script
-        linker_frame = tk.Frame(config_frame, bg='#2b2b2b')
+        linker_frame = self.dark_frame(config_frame)
         linker_frame.pack(fill=tk.X, padx=10, pady=10)
         
         ttk.Label(linker_frame, 
@@ -398,6 +417,7 @@ Perfect For:
         info_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
         
         # Build info text
+        from tkinter import scrolledtext
         self.build_info_text = scrolledtext.ScrolledText(info_frame,
                                                         bg='#1e1e1e',
                                                         fg='#00ff88',
@@ -414,6 +434,7 @@ Perfect For:
         notebook.add(output_frame, text="Output")
         
         # Output text area
+        from tkinter import scrolledtext
         self.output_text = scrolledtext.ScrolledText(output_frame,
                                                     bg='#1e1e1e',
                                                     fg='#00ff88',
@@ -422,7 +443,7 @@ Perfect For:
         self.output_text.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
         # Output controls
-        output_controls = tk.Frame(output_frame, bg='#2b2b2b')
+        output_controls = self.dark_frame(output_frame)
         output_controls.pack(fill=tk.X, padx=20, pady=(0, 20))
         
         # Save output button
@@ -446,26 +467,39 @@ Perfect For:
         timestamp_check.pack(side=tk.RIGHT)
         
     def setup_output_monitor(self):
-        """Set up the output monitor thread"""
-        def monitor_output():
+        """Start draining the output queue on the Tk event loop"""
+        self.root.after(50, self.drain_output)
+        
+    def drain_output(self):
+        """Move all queued messages into the output widget in one insert"""
+        messages = []
+        try:
             while True:
-                try:
-                    message = self.output_queue.get(timeout=0.1)
-                    self.output_text.insert(tk.END, message + "\n")
-                    self.output_text.see(tk.END)
-                    self.output_queue.task_done()
-                except queue.Empty:
-                    continue
-                    
-        self.output_thread = threading.Thread(target=monitor_output, daemon=True)
-        self.output_thread.start()
+                messages.append(self.output_queue.get_nowait())
+        except queue.Empty:
+            pass
+        
+        if messages:
+            # Tags and decoding are applied here so producers only enqueue;
+            # one timestamp per batch, since ticks are only 50 ms apart
+            stamp = time.strftime("[%H:%M:%S] ", time.localtime()) if self.timestamp_var.get() else ""
+            text = "\n".join(
+                f"{stamp}{tag}: {line.decode(errors='replace').rstrip()}" if tag else stamp + line
+                for tag, line in messages
+            )
+            self.output_text.insert(tk.END, text + "\n")
+            
+            lines = int(self.output_text.index('end-1c').split('.')[0])
+            if lines > self.max_output_lines:
+                self.output_text.delete('1.0', f'{lines - self.max_output_lines}.0')
+            
+            self.output_text.see(tk.END)
+            
+        self.root.after(50, self.drain_output)
         
     def log_output(self, message):
-        """Add timestamped message to output queue"""
-        if self.timestamp_var.get():
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            message = f"[{timestamp}] {message}"
-        self.output_queue.put(message)
+        """Add message to output queue (timestamped when drained)"""
+        self.output_queue.put((None, message))
         
     def build_rajos(self):
         """Build RajOS using the build system"""
@@ -474,34 +508,49 @@ Perfect For:
         self.progress.start()
         self.status_label.config(text="Status: Building...")
         
-        def build_thread():
-            try:
-                # Check if build.py exists
-                if not os.path.exists("build.py"):
-                    self.log_output("ERROR: build.py not found!")
-                    return
-                
-                # Run build
-                result = subprocess.run([sys.executable, "build.py"], 
-                                      capture_output=True, text=True, timeout=60)
-                
-                if result.returncode == 0:
-                    self.log_output("SUCCESS: Build completed successfully!")
-                    self.log_output(f"Build output:\n{result.stdout}")
-                    self.run_btn.config(state=tk.NORMAL)
-                else:
-                    self.log_output(f"ERROR: Build failed with return code {result.returncode}")
-                    self.log_output(f"Build errors:\n{result.stderr}")
-                    
-            except subprocess.TimeoutExpired:
-                self.log_output("TIMEOUT: Build timed out after 60 seconds")
-            except Exception as e:
-                self.log_output(f"ERROR: Build error: {str(e)}")
-            finally:
-                self.root.after(0, self.build_finished)
-                
-        threading.Thread(target=build_thread, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self.run_build(), self.loop)
         
+    async def run_build(self):
+        """Run build.py and stream its output while it builds"""
+        process = None
+        try:
+            # Check if build.py exists
+            if not os.path.exists("build.py"):
+                self.log_output("ERROR: build.py not found!")
+                return
+            
+            # Run build unbuffered so progress shows up as it happens
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, "-u", "build.py",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            
+            await asyncio.wait_for(asyncio.gather(
+                self.pump_stream(process.stdout, "BUILD"),
+                self.pump_stream(process.stderr, "BUILD ERROR"),
+                process.wait()
+            ), timeout=60)
+            
+            if process.returncode == 0:
+                self.log_output("SUCCESS: Build completed successfully!")
+                self.root.after(0, lambda: self.run_btn.config(state=tk.NORMAL))
+            else:
+                self.log_output(f"ERROR: Build failed with return code {process.returncode}")
+                
+        except asyncio.TimeoutError:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                # build.py exited right at the deadline
+                pass
+            await process.wait()
+            self.log_output("TIMEOUT: Build timed out after 60 seconds")
+        except Exception as e:
+            self.log_output(f"ERROR: Build error: {str(e)}")
+        finally:
+            self.root.after(0, self.build_finished)
+            
     def build_finished(self):
         """Called when build process finishes"""
         self.build_btn.config(state=tk.NORMAL)
@@ -509,20 +558,23 @@ Perfect For:
         self.status_label.config(text="Status: Build finished")
         
     def check_qemu(self):
-        """Check if QEMU is available and return the path"""
+        """Check if QEMU is available and return the resolved path"""
         import shutil
-        from pathlib import Path
-        
-        qemu_paths = [
-            "qemu-system-arm",  # Standard path
-            "C:\\Program Files\\qemu\\qemu-system-arm.exe"  # Windows path
-        ]
         
-        for qemu_path in qemu_paths:
-            if shutil.which(qemu_path) or Path(qemu_path).exists():
-                return qemu_path
+        # Resolve once; later runs reuse the absolute path
+        if self.qemu_path is None:
+            qemu_paths = [
+                "qemu-system-arm",  # Standard path
+                "C:\\Program Files\\qemu\\qemu-system-arm.exe"  # Windows path
+            ]
+            
+            for qemu_path in qemu_paths:
+                resolved = shutil.which(qemu_path)
+                if resolved:
+                    self.qemu_path = resolved
+                    break
         
-        return None
+        return self.qemu_path
 
     def run_rajos(self):
         """Run RajOS in QEMU"""
@@ -539,64 +591,91 @@ Perfect For:
         self.stop_btn.config(state=tk.NORMAL)
         self.progress.start()
         self.status_label.config(text="Status: Running...")
-        self.is_running = True
         
-        def run_thread():
+        # Build QEMU command
+        qemu_cmd = [
+            qemu_path,
+            "-M", self.machine_var.get(),
+            "-cpu", self.cpu_var.get(),
+            "-kernel", "build/rajos.elf",
+            "-nographic"
+        ]
+        
+        if self.output_mode.get() == "file":
+            qemu_cmd.extend(["-serial", "file:rajos_output.txt"])
+        elif self.output_mode.get() == "gui":
+            qemu_cmd.remove("-nographic")
+        
+        self.run_future = asyncio.run_coroutine_threadsafe(self.run_qemu(qemu_cmd), self.loop)
+        self.run_future.add_done_callback(lambda future: self.root.after(0, self.qemu_finished, future))
+        
+    async def pump_stream(self, stream, tag):
+        """Forward each raw line of a subprocess stream to the output queue"""
+        while line := await stream.readline():
+            self.output_queue.put((tag, line))
+            
+    async def run_qemu(self, qemu_cmd):
+        """Run QEMU and stream stdout and stderr concurrently"""
+        try:
+            self.log_output(f"QEMU command: {' '.join(qemu_cmd)}")
+            
+            # Start QEMU
+            # close_fds=False skips the per-spawn descriptor sweep and, with
+            # an absolute qemu path, lets CPython use posix_spawn on Linux
+            process = await asyncio.create_subprocess_exec(
+                *qemu_cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                close_fds=False
+            )
+            self.current_process = process
+            
+            # Monitor output
             try:
-                # Build QEMU command
-                qemu_cmd = [
-                    qemu_path,
-                    "-M", self.machine_var.get(),
-                    "-cpu", self.cpu_var.get(),
-                    "-kernel", "build/rajos.elf",
-                    "-nographic"
-                ]
-                
-                if self.output_mode.get() == "file":
-                    qemu_cmd.extend(["-serial", "file:rajos_output.txt"])
-                elif self.output_mode.get() == "gui":
-                    qemu_cmd.remove("-nographic")
-                
-                self.log_output(f"QEMU command: {' '.join(qemu_cmd)}")
-                
-                # Start QEMU
-                self.current_process = subprocess.Popen(
-                    qemu_cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True
+                await asyncio.gather(
+                    self.pump_stream(process.stdout, "QEMU"),
+                    self.pump_stream(process.stderr, "QEMU Error")
                 )
-                
-                # Monitor output
-                while self.is_running and self.current_process.poll() is None:
-                    output = self.current_process.stdout.readline()
-                    if output:
-                        self.log_output(f"QEMU: {output.strip()}")
-                    error = self.current_process.stderr.readline()
-                    if error:
-                        self.log_output(f"QEMU Error: {error.strip()}")
-                        
-            except Exception as e:
-                self.log_output(f"ERROR: Run error: {str(e)}")
-            finally:
-                self.root.after(0, self.run_finished)
-                
-        threading.Thread(target=run_thread, daemon=True).start()
-        
+                await process.wait()
+            except asyncio.CancelledError:
+                # Stop may have been pressed before current_process was set
+                await self.stop_qemu(process)
+                raise
+            
+        except Exception as e:
+            self.log_output(f"ERROR: Run error: {str(e)}")
+            
+    def qemu_finished(self, future):
+        """Called on the Tk thread once a run_qemu call has ended"""
+        # Runs already dropped by stop_rajos are ignored so a newer run's
+        # state isn't cleared
+        if future is self.run_future:
+            self.current_process = None
+            self.run_future = None
+            self.run_finished()
+            
+    async def stop_qemu(self, process):
+        """Terminate QEMU, killing it if it doesn't exit within 5 seconds"""
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), timeout=5)
+        except ProcessLookupError:
+            pass
+        except asyncio.TimeoutError:
+            process.kill()
+            
     def stop_rajos(self):
         """Stop the running QEMU process"""
         if self.current_process:
             self.log_output("Stopping QEMU...")
-            self.is_running = False
-            self.current_process.terminate()
-            try:
-                self.current_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.current_process.kill()
+            asyncio.run_coroutine_threadsafe(self.stop_qemu(self.current_process), self.loop)
             self.current_process = None
             
+        if self.run_future:
+            # Also drops a launch whose QEMU hasn't been spawned yet
+            self.run_future.cancel()
+            self.run_future = None
+            
         self.run_finished()
         
     def run_finished(self):
@@ -605,7 +684,6 @@ Perfect For:
         self.stop_btn.config(state=tk.DISABLED)
         self.progress.stop()
         self.status_label.config(text="Status: Ready")
-        self.is_running = False
         
     def clear_output(self):
         """Clear the output text area"""
@@ -614,6 +692,8 @@ Perfect For:
         
     def save_output(self):
         """Save output to file"""
+        from tkinter import filedialog
+        
         filename = filedialog.asksaveasfilename(
             defaultextension=".txt",
             filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
@@ -628,6 +708,8 @@ Perfect For:
                 
     def load_output(self):
         """Load output from file"""
+        from tkinter import filedialog
+        
         filename = filedialog.askopenfilename(
             filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
         )
@@ -8,8 +8,10 @@ Author: Raj Mhetar
 import subprocess
 import sys
 import shutil
+import functools
 from pathlib import Path
 
+@functools.lru_cache(maxsize=1)
 def check_qemu():
     """Check if QEMU is available"""
     qemu_paths = [
@@ -17,9 +19,11 @@ def check_qemu():
         "C:\\Program Files\\qemu\\qemu-system-arm.exe"  # Windows path
     ]
     
+    # shutil.which also handles the absolute Windows path
     for qemu_path in qemu_paths:
-        if shutil.which(qemu_path) or Path(qemu_path).exists():
-            return qemu_path
+        resolved = shutil.which(qemu_path)
+        if resolved:
+            return resolved
     
     return None
 
@@ -9,8 +9,36 @@ import subprocess
 import sys
 import shutil
 import tempfile
+import functools
+import threading
 from pathlib import Path
 
+# QEMU arguments shared by every approach; each adds its own -serial setup
+_BASE_ARGS = ("-M", "versatilepb", "-cpu", "arm926", "-nographic")
+
+# Different approaches to getting output from QEMU on Windows
+_APPROACHES = (
+    {
+        "name": "Method 1: TCP Serial Output",
+        "mode": "tcp",
+        "suffix": ("-serial", "tcp:127.0.0.1:1234,server,nowait"),
+        "note": "Connect with: telnet 127.0.0.1 1234"
+    },
+    {
+        "name": "Method 2: File Output",
+        "mode": "file",
+        "suffix": ("-serial", "file:rajos_output.txt"),
+        "note": "Output will be in rajos_output.txt"
+    },
+    {
+        "name": "Method 3: Monitor Only",
+        "mode": "monitor",
+        "suffix": (),
+        "note": "QEMU monitor - type 'info registers' to see if CPU is running"
+    },
+)
+
+@functools.lru_cache(maxsize=1)
 def check_qemu():
     """Check if QEMU is available"""
     qemu_paths = [
@@ -18,11 +46,46 @@ def check_qemu():
         "C:\\Program Files\\qemu\\qemu-system-arm.exe"
     ]
     
+    # shutil.which also handles the absolute Windows path
     for qemu_path in qemu_paths:
-        if shutil.which(qemu_path) or Path(qemu_path).exists():
-            return qemu_path
+        resolved = shutil.which(qemu_path)
+        if resolved:
+            return resolved
     return None
 
+def invalidate_qemu_cache():
+    """Forget the cached QEMU path so the next check searches again"""
+    check_qemu.cache_clear()
+
+def tail_file(path, stop):
+    """Print text appended to path until stop is set"""
+    while not path.exists():
+        if stop.wait(0.1):
+            return
+    
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read()
+            if chunk:
+                sys.stdout.write(chunk.decode(errors="replace"))
+                sys.stdout.flush()
+            elif stop.wait(0.1):
+                # Pick up anything written just before QEMU exited
+                sys.stdout.write(f.read().decode(errors="replace"))
+                return
+
+def stop_process(process):
+    """Terminate a process, killing it if it doesn't exit within 2 seconds"""
+    if process.poll() is not None:
+        return
+    
+    process.terminate()
+    try:
+        process.wait(timeout=2)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
 def run_rajos_windows():
     """Run RajOS with Windows-compatible QEMU settings"""
     print("RajOS Windows Test Runner")
@@ -45,34 +108,17 @@ def run_rajos_windows():
     print(f"Running: {elf_file}")
     print()
     
-    # Try different approaches
-    approaches = [
-        {
-            "name": "Method 1: TCP Serial Output",
-            "cmd": [qemu_cmd, "-M", "versatilepb", "-cpu", "arm926", 
-                   "-kernel", str(elf_file), "-nographic", 
-                   "-serial", "tcp:127.0.0.1:1234,server,nowait"],
-            "note": "Connect with: telnet 127.0.0.1 1234"
-        },
-        {
-            "name": "Method 2: File Output", 
-            "cmd": [qemu_cmd, "-M", "versatilepb", "-cpu", "arm926",
-                   "-kernel", str(elf_file), "-nographic",
-                   "-serial", "file:rajos_output.txt"],
-            "note": "Output will be in rajos_output.txt"
-        },
-        {
-            "name": "Method 3: Monitor Only",
-            "cmd": [qemu_cmd, "-M", "versatilepb", "-cpu", "arm926",
-                   "-kernel", str(elf_file), "-nographic"],
-            "note": "QEMU monitor - type 'info registers' to see if CPU is running"
-        }
-    ]
+    # Compose each command line once, along with its printable form
+    elf_str = str(elf_file)
+    approaches = []
+    for approach in _APPROACHES:
+        cmd = [qemu_cmd, *_BASE_ARGS, "-kernel", elf_str, *approach["suffix"]]
+        approaches.append((approach, cmd, " ".join(cmd)))
     
-    for i, approach in enumerate(approaches, 1):
+    for i, (approach, cmd, joined) in enumerate(approaches, 1):
         print(f"\n{approach['name']}")
         print(f"Note: {approach['note']}")
-        print("Command:", " ".join(approach['cmd']))
+        print("Command:", joined)
         
         response = input(f"Try method {i}? (y/n/q): ").lower()
         
@@ -83,24 +129,33 @@ def run_rajos_windows():
                 print("Starting QEMU... Press Ctrl+C to stop")
                 print("-" * 40)
                 
-                if "file:" in " ".join(approach['cmd']):
-                    # For file output, run for 10 seconds then show file
-                    process = subprocess.Popen(approach['cmd'])
-                    import time
-                    time.sleep(10)
-                    process.terminate()
-                    
-                    # Show file content
+                if approach["mode"] == "file":
+                    # For file output, stream the file for up to 10 seconds
                     output_file = Path("rajos_output.txt")
-                    if output_file.exists():
-                        print("RajOS Output:")
-                        print(output_file.read_text())
-                    else:
+                    output_file.unlink(missing_ok=True)
+                    process = subprocess.Popen(cmd)
+                    
+                    print("RajOS Output:")
+                    stop = threading.Event()
+                    tail = threading.Thread(target=tail_file, args=(output_file, stop), daemon=True)
+                    tail.start()
+                    
+                    try:
+                        process.wait(timeout=10)
+                    except subprocess.TimeoutExpired:
+                        pass
+                    finally:
+                        # Also runs on Ctrl+C so QEMU doesn't outlive this method
+                        stop_process(process)
+                        stop.set()
+                        tail.join()
+                    
+                    if not output_file.exists():
                         print("No output file created")
                         
                 else:
                     # For other methods, run interactively
-                    subprocess.run(approach['cmd'])
+                    subprocess.run(cmd)
                     
             except KeyboardInterrupt:
                 print("\nStopped by user")
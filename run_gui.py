@@ -5,7 +5,7 @@ Simple script to launch the RajOS GUI application
 """
 
 import sys
-import os
+import importlib.util
 
 def main():
     """Launch the RajOS GUI"""
@@ -20,8 +20,9 @@ def main():
         print("Please install tkinter or use a Python distribution that includes it")
         return 1
     
-    # Check if the GUI file exists
-    if not os.path.exists("rajos_gui.py"):
+    # Locate the GUI module; the same lookup is reused to load it
+    spec = importlib.util.find_spec("rajos_gui")
+    if spec is None:
         print("ERROR: rajos_gui.py not found")
         print("Please make sure you're in the correct directory")
         return 1
@@ -29,7 +30,9 @@ def main():
     # Launch the GUI
     try:
         print("Starting RajOS GUI...")
-        import rajos_gui
+        rajos_gui = importlib.util.module_from_spec(spec)
+        sys.modules["rajos_gui"] = rajos_gui
+        spec.loader.exec_module(rajos_gui)
         rajos_gui.main()
         return 0
     except Exception as e:
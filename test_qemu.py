@@ -5,8 +5,22 @@ Simple QEMU test script for mps2-an385 machine
 
 import subprocess
 import sys
+import shutil
+import threading
 from pathlib import Path
 
+from run_fixed import stop_process
+
+# Resolved once at import; falls back to the default Windows install
+_QEMU = shutil.which("qemu-system-arm") or r"C:\Program Files\qemu\qemu-system-arm.exe"
+
+def echo_output(stream):
+    """Copy a pipe to stdout as chunks arrive, until EOF"""
+    for chunk in iter(lambda: stream.read(4096), b""):
+        sys.stdout.flush()
+        sys.stdout.buffer.write(chunk)
+        sys.stdout.buffer.flush()
+
 def test_qemu_mps2():
     """Test QEMU mps2-an385 machine with our RajOS build"""
     print("Testing QEMU mps2-an385 with RajOS")
@@ -21,13 +35,11 @@ def test_qemu_mps2():
         print("Please run: python build.py")
         return False
     
-            print(f"SUCCESS: Found RajOS build: {elf_file}")
+    print(f"SUCCESS: Found RajOS build: {elf_file}")
     
     # Test QEMU command
-    qemu_cmd = "C:\\Program Files\\qemu\\qemu-system-arm.exe"
-    
     cmd = [
-        qemu_cmd,
+        _QEMU,
         "-M", "lm3s6965evb",
         "-kernel", str(elf_file),
         "-nographic",
@@ -42,8 +54,18 @@ def test_qemu_mps2():
     print("-" * 50)
     
     try:
-        # Run QEMU with debug output
-        result = subprocess.run(cmd, timeout=10)
+        # Run QEMU with debug output, echoing it while it runs
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT, bufsize=0)
+        reader = threading.Thread(target=echo_output, args=(process.stdout,), daemon=True)
+        reader.start()
+        
+        try:
+            process.wait(timeout=10)
+        finally:
+            stop_process(process)
+            reader.join(timeout=1)
+        
         print("SUCCESS: QEMU test completed successfully")
         return True
         